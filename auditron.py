@@ -1,66 +1,304 @@
 #!/usr/bin/env python3
 import argparse
+import shlex
+import sqlite3
+import sys
 import time
-from typing import List, Tuple
-
-from strategies.base import AuditContext
-from strategies.osinfo import OSInfo
-from strategies.processes import Processes
-from strategies.routes import Routes
-from strategies.rpm_inventory import RpmInventory
-from strategies.rpm_verify import RpmVerify
-from strategies.sockets import Sockets
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+try:
+    from rich.progress import Progress
+except ImportError:  # rich is optional; fall back to silent runs
+    Progress = None
+
+from strategies import REGISTRY
+from strategies.base import AuditCheck, AuditContext
 from utils import db
+from utils.compress import sha256_bytes
 from utils.ssh_runner import SSHClient
 
+MAX_WORKERS = 32
 
-def run_all_checks(ctx: AuditContext) -> None:
-    checks: List[type] = [OSInfo, Processes, Routes, RpmInventory, RpmVerify, Sockets]
-    for Check in checks:
-        Check().run(ctx)
+# Strategies are stateless (they take ctx at run()), so instantiate the
+# registry once instead of len(hosts) * len(REGISTRY) times.
+STRATEGIES: List[AuditCheck] = [cls() for cls in REGISTRY]
 
 
-def run_mode(db_path: str, mode: str) -> None:
-    conn = db.connect(db_path)
-    db.ensure_schema(conn)
-    session_id = db.new_session(conn, mode)
+# Binaries any strategy may need, probed in a single SSH round-trip per host.
+PROBE_BINARIES = ("ip", "netstat", "nmcli", "ps", "rpm", "ss")
+
+
+def probe_capabilities(ssh: SSHClient) -> dict:
+    """Resolve availability of all strategy-required binaries in one SSH call."""
+    cmd = "; ".join(
+        f'command -v {b} >/dev/null 2>&1 && echo "{b}=1" || echo "{b}=0"'
+        for b in PROBE_BINARIES
+    )
+    res = ssh.run(cmd)
+    caps: dict = {}
+    for ln in res.out.splitlines():
+        name, _, val = ln.strip().partition("=")
+        if name in PROBE_BINARIES:
+            caps[name] = val == "1"
+    return caps
+
+
+# Framing for the per-host batch script: group separator between sections,
+# record separator between a section's name and its output.
+SECTION_SEP = "\x1d"
+SECTION_NAME_SEP = "\x1e"
+
+
+def prefetch_sections(ctx: AuditContext, checks) -> dict:
+    """Run every check's primary command in one framed remote script.
+
+    Across a fleet the dominant cost is SSH round-trip latency, not command
+    execution; batching collapses up to len(checks) execs into one. Checks
+    whose section is missing or empty fall back to their own ssh.run().
+    """
+    cmds = [
+        (check.name, check.batch_command(ctx))
+        for check in checks
+        if check.probe_cached(ctx)
+    ]
+    cmds = [(name, cmd) for name, cmd in cmds if cmd]
+    if len(cmds) < 2:
+        return {}
+    script = "; ".join(
+        f"printf '\\035%s\\036' {shlex.quote(name)}; {{ {cmd}; }}"
+        for name, cmd in cmds
+    )
+    res = ctx.ssh.run(script)
+    # A nonzero rc means the script was cut short (SSH drop, timeout): the
+    # section that was streaming at the time is truncated, so trust none of
+    # them and let every check fall back to its own ssh.run(). Healthy
+    # batches end rc 0 because each section is printf-framed.
+    if res.rc != 0 or not res.out:
+        return {}
+    names = {name for name, _ in cmds}
+    sections = {}
+    for chunk in res.out.split(SECTION_SEP):
+        name, sep, out = chunk.partition(SECTION_NAME_SEP)
+        if sep and name in names:
+            sections[name] = out
+    return sections
+
+
+def parse_skip(spec: Optional[str]) -> frozenset:
+    """Parse a comma-separated --skip list, tolerating whitespace around names."""
+    return frozenset(s.strip() for s in (spec or "").split(",") if s.strip())
+
+
+def check_signature(capabilities: Optional[dict]) -> str:
+    """Content signature for the cache key: the host's probed capabilities."""
+    return sha256_bytes(repr(sorted((capabilities or {}).items())).encode("ascii"))
+
 
-    hosts = db.get_hosts(conn)
-    for host in hosts:
-        ssh = SSHClient(host)
-        ctx = AuditContext(
-            host=host, ssh=ssh, db=conn, limits={}, clock=time, session_id=session_id
+def run_one_check(ctx: AuditContext, check, use_cache: bool = False) -> None:
+    if not check.probe_cached(ctx):
+        return
+    host_id = ctx.host["id"]
+    if use_cache:
+        # Skip only checks that already SUCCEEDed in the session being
+        # resumed: the cache signature covers capabilities, not check
+        # inputs, so a match alone must never suppress a fresh run.
+        sig = check_signature(ctx.capabilities)
+        cached = db.get_check_cache(ctx.db, host_id, check.name)
+        done = db.last_success_run(ctx.db, ctx.session_id, host_id, check.name)
+        if cached and cached[0] == sig and done is not None:
+            cid = db.start_check(ctx.db, ctx.session_id, host_id, check.name)
+            db.mark_check(ctx.db, cid, "SKIP", "cached")
+            return
+    check.run(ctx)
+    rid = db.last_success_run(ctx.db, ctx.session_id, host_id, check.name)
+    if rid is not None:
+        db.set_check_cache(
+            ctx.db, host_id, check.name, check_signature(ctx.capabilities), rid
         )
-        run_all_checks(ctx)
 
-    db.finish_session(conn, session_id)
 
+def run_all_checks(
+    ctx: AuditContext, skip: frozenset = frozenset(), use_cache: bool = False
+) -> None:
+    for check in STRATEGIES:
+        if check.name in skip:
+            continue
+        run_one_check(ctx, check, use_cache)
+
+
+def run_host(
+    host: sqlite3.Row,
+    ssh: SSHClient,
+    session_id: int,
+    skip: frozenset = frozenset(),
+    check_workers: int = 1,
+    use_cache: bool = False,
+) -> None:
+    """Audit a single host on pooled SQLite connections (one per worker thread).
+
+    With check_workers > 1, independent checks run concurrently over the host's
+    multiplexed SSH session, each on its own pooled connection, collapsing
+    per-host wall time toward the slowest check instead of the sum of all six.
+    """
+    capabilities = probe_capabilities(ssh)
+    checks = [c for c in STRATEGIES if c.name not in skip]
+
+    def build_ctx(conn, cache=None) -> AuditContext:
+        return AuditContext(
+            host=host,
+            ssh=ssh,
+            db=conn,
+            limits=db.resolve_limits(conn, host["id"]),
+            clock=time,
+            session_id=session_id,
+            capabilities=capabilities,
+            cache=cache,
+        )
+
+    if check_workers > 1:
+        with db.pool_acquire() as conn:
+            sections = prefetch_sections(build_ctx(conn), checks)
+
+        def run_check(check) -> None:
+            with db.pool_acquire() as conn:
+                ctx = build_ctx(conn, cache=sections)
+                with conn:
+                    run_one_check(ctx, check, use_cache)
+
+        with ThreadPoolExecutor(max_workers=min(check_workers, len(checks))) as ex:
+            for fut in as_completed([ex.submit(run_check, c) for c in checks]):
+                fut.result()
+        return
+
+    with db.pool_acquire() as conn:
+        ctx = build_ctx(conn)
+        ctx.cache = prefetch_sections(ctx, checks)
+        # One transaction per host: start_check/mark_check no longer commit
+        # individually, so all ~12 status writes land in a single fsync.
+        with conn:
+            run_all_checks(ctx, skip, use_cache)
 
-def run_resume(db_path: str) -> None:
+
+def audit_hosts(
+    db_path: str,
+    hosts,
+    session_id: int,
+    skip: frozenset = frozenset(),
+    check_workers: int = 1,
+    use_cache: bool = False,
+    total: Optional[int] = None,
+) -> None:
+    """Audit hosts concurrently; each host's SSH round-trips dominate, so I/O overlaps.
+
+    hosts may be any iterable; get_hosts() yields rows lazily so the first
+    audit starts after one row is read instead of after the whole fleet loads.
+    total (from count_hosts) sizes the progress bar and worker pool.
+    """
+    if total == 0:
+        return
+    db.init_pool(db_path)
+    workers = MAX_WORKERS if total is None else min(MAX_WORKERS, total)
+    try:
+        # Only render progress on an interactive tty; per-host prints would
+        # dominate I/O on slow or piped terminals, so updates are coalesced
+        # into done-callbacks against a low-refresh live display.
+        progress = None
+        if Progress is not None and sys.stdout.isatty():
+            progress = Progress(refresh_per_second=4)
+        if progress:
+            progress.start()
+            task = progress.add_task("Auditing hosts", total=total)
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                futures = []
+                # One SSHClient per host for the whole run, so the option list
+                # (and the ControlMaster socket it names) is computed once.
+                with db.pool_acquire() as conn:
+                    for host in hosts:
+                        ssh = SSHClient(
+                            host,
+                            timeout=db.resolve_limits(conn, host["id"])[
+                                "command_timeout_sec"
+                            ],
+                        )
+                        fut = ex.submit(
+                            run_host,
+                            host,
+                            ssh,
+                            session_id,
+                            skip,
+                            check_workers,
+                            use_cache,
+                        )
+                        if progress:
+                            fut.add_done_callback(lambda _f: progress.advance(task))
+                        futures.append(fut)
+                for fut in as_completed(futures):
+                    fut.result()
+        finally:
+            if progress:
+                progress.stop()
+    finally:
+        db.close_pool()
+
+
+def run_mode(
+    db_path: str,
+    mode: str,
+    skip: frozenset = frozenset(),
+    host_filter: Optional[str] = None,
+    check_workers: int = 1,
+    force: bool = False,
+) -> None:
+    """Single audit entry point for both fresh and resume runs."""
     conn = db.connect(db_path)
     db.ensure_schema(conn)
-    session_id = db.get_unfinished_session(conn)
-    if session_id is None:
-        print("No unfinished session found.")
-        return
+    if mode == "resume":
+        session_id = db.get_unfinished_session(conn)
+        if session_id is None:
+            print("No unfinished session found.")
+            return
+        # On resume, checks that already succeeded with an unchanged probe
+        # signature are recorded as SKIP instead of re-executed (--force re-runs).
+        use_cache = not force
+    else:
+        session_id = db.new_session(conn, mode)
+        use_cache = False
 
-    hosts = db.get_hosts(conn)
-    for host in hosts:
-        ssh = SSHClient(host)
-        ctx = AuditContext(
-            host=host, ssh=ssh, db=conn, limits={}, clock=time, session_id=session_id
-        )
-        run_all_checks(ctx)
+    db.load_limits(conn)
+    total = db.count_hosts(conn, hostname_or_ip=host_filter)
+    hosts = db.get_hosts(conn, hostname_or_ip=host_filter)
+    audit_hosts(db_path, hosts, session_id, skip, check_workers, use_cache, total)
 
     db.finish_session(conn, session_id)
 
 
-def parse_cli() -> Tuple[str, str]:
+def parse_cli() -> Tuple[str, argparse.Namespace]:
     """Support either positional mode or flags (--fresh / --resume)."""
     parser = argparse.ArgumentParser(description="Auditron - Host auditing tool")
     parser.add_argument(
         "--db", default="auditron.db", help="Path to the SQLite database file"
     )
+    parser.add_argument(
+        "--skip",
+        default="",
+        help="Comma-separated check names to skip (e.g. 'osinfo, processes')",
+    )
+    parser.add_argument(
+        "--host", help="Audit only the host with this hostname or IP"
+    )
+    parser.add_argument(
+        "--check-workers",
+        type=int,
+        default=1,
+        help="Run up to N checks per host concurrently (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="On resume, re-run checks even when the cached result is current",
+    )
     # Optional flags for mode (backward/forward compatible with CI & humans)
     group = parser.add_mutually_exclusive_group()
     group.add_argument("--fresh", action="store_true", help="Start a fresh session")
@@ -91,15 +329,20 @@ def parse_cli() -> Tuple[str, str]:
             "Specify mode: 'fresh' or 'resume' (positional) or use --fresh/--resume"
         )
 
-    return mode, args.db
+    return mode, args
 
 
 def main() -> None:
-    mode, db_path = parse_cli()
-    if mode == "fresh":
-        run_mode(db_path, "fresh")
-    else:
-        run_resume(db_path)
+    mode, args = parse_cli()
+    skip = parse_skip(args.skip)
+    run_mode(
+        args.db,
+        mode,
+        skip,
+        host_filter=args.host,
+        check_workers=args.check_workers,
+        force=args.force,
+    )
 
 
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ CREATE TABLE IF NOT EXISTS hosts (
   ssh_port INTEGER DEFAULT 22,
   use_sudo INTEGER DEFAULT 1
 );
+CREATE INDEX IF NOT EXISTS ix_hosts_hostname ON hosts(hostname);
+CREATE INDEX IF NOT EXISTS ix_hosts_ip ON hosts(ip);
 
 CREATE TABLE IF NOT EXISTS sessions (
   id INTEGER PRIMARY KEY,
@@ -59,6 +61,7 @@ CREATE TABLE IF NOT EXISTS global_defaults (
   routes INTEGER DEFAULT 1,
   max_snapshot_bytes INTEGER DEFAULT 524288,
   gzip_snapshots INTEGER DEFAULT 1,
+  compress_alg TEXT DEFAULT 'zstd' CHECK (compress_alg IN ('zstd','gzip')),
   command_timeout_sec INTEGER DEFAULT 60
 );
 
@@ -71,9 +74,20 @@ CREATE TABLE IF NOT EXISTS host_overrides (
   firewall INTEGER, netif INTEGER, hw INTEGER, routes INTEGER,
   max_snapshot_bytes INTEGER,
   gzip_snapshots INTEGER,
+  compress_alg TEXT CHECK (compress_alg IN ('zstd','gzip')),
   command_timeout_sec INTEGER
 );
 
+-- Last successful run per (host, check), keyed by a probe signature so
+-- --resume can skip checks whose inputs are unchanged.
+CREATE TABLE IF NOT EXISTS check_cache (
+  host_id INTEGER NOT NULL REFERENCES hosts(id) ON DELETE CASCADE,
+  check_name TEXT NOT NULL,
+  sig TEXT,
+  rid INTEGER REFERENCES check_runs(id),
+  PRIMARY KEY (host_id, check_name)
+);
+
 CREATE TABLE IF NOT EXISTS rpm_packages (
   id INTEGER PRIMARY KEY,
   host_id INTEGER NOT NULL REFERENCES hosts(id) ON DELETE CASCADE,
@@ -91,10 +105,14 @@ CREATE INDEX IF NOT EXISTS ix_file_meta_path ON file_meta(path);
 
 CREATE TABLE IF NOT EXISTS file_snapshots (
   id INTEGER PRIMARY KEY,
-  sha256 TEXT UNIQUE,
-  content_gz BLOB,
-  length_bytes INTEGER,
-  mime TEXT,
+  path TEXT,
+  mode INTEGER, uid INTEGER, gid INTEGER, size INTEGER, mtime INTEGER, inode INTEGER,
+  sha256 TEXT,
+  gz_len INTEGER,
+  gz_b64 TEXT,
+  -- Compression algorithm of the stored payload ('zstd' or 'gzip'); the
+  -- column names stay codec-agnostic.
+  codec TEXT DEFAULT 'gzip',
   captured_at TEXT
 );
 
@@ -148,8 +166,12 @@ CREATE TABLE IF NOT EXISTS listen_sockets (
 CREATE TABLE IF NOT EXISTS processes (
   id INTEGER PRIMARY KEY,
   host_id INTEGER NOT NULL REFERENCES hosts(id) ON DELETE CASCADE,
+  -- Snapshots are appended per session; "current" = rows from the latest
+  -- session for the host, older sessions are history.
+  session_id INTEGER REFERENCES sessions(id) ON DELETE SET NULL,
   pid INTEGER, ppid INTEGER, user TEXT, start_time TEXT, etime TEXT, cmd TEXT
 );
+CREATE INDEX IF NOT EXISTS ix_processes_host_session ON processes(host_id, session_id);
 
 CREATE TABLE IF NOT EXISTS proc_open_files (
   id INTEGER PRIMARY KEY,
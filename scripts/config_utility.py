@@ -1,32 +1,94 @@
 #!/usr/bin/env python3
+import hashlib
+import mmap
 import os
 import sqlite3
+import sys
+
+try:
+    import readline
+except ImportError:  # not on Windows unless pyreadline3 is installed
+    readline = None
 
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "db", "auditron.db")
 SCHEMA = os.path.join(os.path.dirname(os.path.dirname(__file__)), "docs", "schema.sql")
 
+SELECT_ALL_GD = "SELECT * FROM global_defaults WHERE id=1"
+SELECT_ALL_HO = "SELECT * FROM host_overrides WHERE host_id=?"
+INSERT_HOST_SQL = (
+    "INSERT INTO hosts(hostname,ip,ssh_user,ssh_key_path,ssh_port,use_sudo) "
+    "VALUES (?,?,?,?,?,?)"
+)
+
+# Table layouts never change while the utility runs; introspect each once.
+_table_cols_cache: dict = {}
+
+
+def table_cols(c, table):
+    if table not in _table_cols_cache:
+        _table_cols_cache[table] = [
+            d[0] for d in c.execute(f"PRAGMA table_info({table})")
+        ]
+    return _table_cols_cache[table]
+
 
 def conn():
     c = sqlite3.connect(DB_PATH)
     c.execute("PRAGMA foreign_keys=ON;")
+    # Interactive config trades durability for responsiveness: the DB is tiny
+    # and recreatable (seed_db.py + schema.sql), while an fsync per toggle on
+    # USB media makes the menu feel typewriter-paced. If power dies mid-menu,
+    # rerun the utility.
+    c.execute("PRAGMA synchronous=OFF;")
+    c.execute("PRAGMA journal_mode=MEMORY;")
+    c.execute("PRAGMA temp_store=MEMORY;")
     return c
 
 
+def _schema_version(schema_bytes):
+    # 31-bit content hash of schema.sql, stored in PRAGMA user_version so an
+    # already-initialized DB can skip executescript entirely.
+    return (
+        int.from_bytes(
+            hashlib.blake2b(schema_bytes, digest_size=4).digest(), "big"
+        )
+        & 0x7FFFFFFF
+    ) or 1
+
+
 def ensure_schema(c):
-    with open(SCHEMA, "r", encoding="utf-8") as f:
-        c.executescript(f.read())
-        c.commit()
+    # mmap lets the OS demand-page the schema off (possibly slow USB) storage
+    # instead of buffering the whole file into the Python heap up front.
+    with open(SCHEMA, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+        schema_bytes = mm[:]
+    version = _schema_version(schema_bytes)
+    if c.execute("PRAGMA user_version").fetchone()[0] == version:
+        return
+    c.executescript(schema_bytes.decode("utf-8"))
+    c.execute(f"PRAGMA user_version={version}")
+    c.commit()
 
 
 def list_hosts(c):
     cur = c.execute(
         "SELECT id,hostname,ip,ssh_user,ssh_port,use_sudo FROM hosts ORDER BY id"
     )
-    print("\nHosts:")
-    for row in cur.fetchall():
-        print(
-            f"  [{row[0]}] {row[1]} ({row[2]}) user={row[3]} port={row[4]} sudo={'yes' if row[5] else 'no'}"
-        )
+    # One buffered write instead of a print (stdout lock + flush) per row.
+    lines = ["", "Hosts:"]
+    lines.extend(
+        f"  [{row[0]}] {row[1]} ({row[2]}) user={row[3]} port={row[4]} sudo={'yes' if row[5] else 'no'}"
+        for row in cur
+    )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def add_host_bulk(c, rows):
+    """Insert many (hostname, ip, user, key, port, sudo) rows: one parsed
+    statement, one transaction, one sync - the path for scripted onboarding."""
+    with c:
+        c.executemany(INSERT_HOST_SQL, rows)
 
 
 def add_host(c):
@@ -36,44 +98,42 @@ def add_host(c):
     key = input("SSH key path (optional): ").strip() or None
     port = int(input("SSH port [22]: ").strip() or "22")
     sudo = input("Use sudo? [y/N]: ").strip().lower() == "y"
-    c.execute(
-        "INSERT INTO hosts(hostname,ip,ssh_user,ssh_key_path,ssh_port,use_sudo) VALUES (?,?,?,?,?,?)",
-        (h, ip, user, key, port, 1 if sudo else 0),
-    )
-    c.commit()
+    add_host_bulk(c, [(h, ip, user, key, port, 1 if sudo else 0)])
     print("Host added.")
 
 
 def remove_host(c):
     hid = int(input("Host id to remove: ").strip())
-    c.execute("DELETE FROM hosts WHERE id=?", (hid,))
-    c.commit()
+    with c:
+        c.execute("DELETE FROM hosts WHERE id=?", (hid,))
     print("Host removed.")
 
 
 def defaults_menu(c):
-    cur = c.execute("SELECT * FROM global_defaults WHERE id=1")
+    cur = c.execute(SELECT_ALL_GD)
     row = cur.fetchone()
     if not row:
         c.execute("INSERT INTO global_defaults(id) VALUES(1)")
         c.commit()
-    cols = [d[0] for d in c.execute("PRAGMA table_info(global_defaults)")]
-    cols = cols[1:]
+    cols = table_cols(c, "global_defaults")[1:]
     flags = [
         k
         for k in cols
         if k not in ("max_snapshot_bytes", "gzip_snapshots", "command_timeout_sec")
     ]
+    # Build each flag's UPDATE once; toggles then reuse the identical SQL text
+    # (cached statement) instead of re-concatenating an f-string per toggle.
+    update_stmts = {k: f"UPDATE global_defaults SET {k}=? WHERE id=1" for k in flags}
     while True:
-        row = c.execute("SELECT * FROM global_defaults WHERE id=1").fetchone()
+        row = c.execute(SELECT_ALL_GD).fetchone()
         vals = dict(zip(["id"] + cols, row))
-        print("\nGlobal default checks (1=on,0=off):")
-        for i, k in enumerate(flags, 1):
-            print(f"  {i}. {k} = {vals.get(k)}")
-        print(
+        lines = ["", "Global default checks (1=on,0=off):"]
+        lines.extend(f"  {i}. {k} = {vals.get(k)}" for i, k in enumerate(flags, 1))
+        lines.append(
             "  s) set limits (max_snapshot_bytes, gzip_snapshots, command_timeout_sec)"
         )
-        print("  q) back")
+        lines.append("  q) back")
+        sys.stdout.write("\n".join(lines) + "\n")
         ch = input("> ").strip()
         if ch == "q":
             break
@@ -81,33 +141,35 @@ def defaults_menu(c):
             msb = input(
                 f"max_snapshot_bytes [{vals.get('max_snapshot_bytes')}]: "
             ).strip()
-            if msb:
-                c.execute(
-                    "UPDATE global_defaults SET max_snapshot_bytes=? WHERE id=1",
-                    (int(msb),),
-                )
             gz = input(f"gzip_snapshots [{vals.get('gzip_snapshots')}]: ").strip()
-            if gz:
-                c.execute(
-                    "UPDATE global_defaults SET gzip_snapshots=? WHERE id=1", (int(gz),)
-                )
             to = input(
                 f"command_timeout_sec [{vals.get('command_timeout_sec')}]: "
             ).strip()
-            if to:
-                c.execute(
-                    "UPDATE global_defaults SET command_timeout_sec=? WHERE id=1",
-                    (int(to),),
-                )
-            c.commit()
+            # One transaction (and one sync) for the whole limits batch.
+            with c:
+                if msb:
+                    c.execute(
+                        "UPDATE global_defaults SET max_snapshot_bytes=? WHERE id=1",
+                        (int(msb),),
+                    )
+                if gz:
+                    c.execute(
+                        "UPDATE global_defaults SET gzip_snapshots=? WHERE id=1",
+                        (int(gz),),
+                    )
+                if to:
+                    c.execute(
+                        "UPDATE global_defaults SET command_timeout_sec=? WHERE id=1",
+                        (int(to),),
+                    )
             continue
         try:
             idx = int(ch) - 1
             key = flags[idx]
             curv = vals.get(key)
             newv = 0 if curv == 1 else 1
-            c.execute(f"UPDATE global_defaults SET {key}=? WHERE id=1", (newv,))
-            c.commit()
+            with c:
+                c.execute(update_stmts[key], (newv,))
         except Exception:
             print("Invalid choice.")
 
@@ -119,7 +181,7 @@ def host_overrides_menu(c):
     if not cur:
         c.execute("INSERT INTO host_overrides(host_id) VALUES (?)", (hid,))
         c.commit()
-    cols = [d[0] for d in c.execute("PRAGMA table_info(host_overrides)")]
+    cols = table_cols(c, "host_overrides")
     flags = [
         k
         for k in cols
@@ -132,19 +194,20 @@ def host_overrides_menu(c):
             "command_timeout_sec",
         )
     ]
+    update_stmts = {
+        k: f"UPDATE host_overrides SET {k}=? WHERE host_id=?" for k in flags
+    }
     while True:
-        row = c.execute(
-            "SELECT * FROM host_overrides WHERE host_id=?", (hid,)
-        ).fetchone()
+        row = c.execute(SELECT_ALL_HO, (hid,)).fetchone()
         vals = dict(zip(cols, row))
-        print("\nOverrides (None=inherit, 1=on, 0=off):")
-        for i, k in enumerate(flags, 1):
-            print(f"  {i}. {k} = {vals.get(k)}")
-        print(
+        lines = ["", "Overrides (None=inherit, 1=on, 0=off):"]
+        lines.extend(f"  {i}. {k} = {vals.get(k)}" for i, k in enumerate(flags, 1))
+        lines.append(
             "  s) set limits (max_snapshot_bytes, gzip_snapshots, command_timeout_sec)"
         )
-        print("  n) clear all overrides (set to NULL)")
-        print("  q) back")
+        lines.append("  n) clear all overrides (set to NULL)")
+        lines.append("  q) back")
+        sys.stdout.write("\n".join(lines) + "\n")
         ch = input("> ").strip()
         if ch == "q":
             break
@@ -156,33 +219,33 @@ def host_overrides_menu(c):
                     + ["max_snapshot_bytes", "gzip_snapshots", "command_timeout_sec"]
                 ]
             )
-            c.execute(f"UPDATE host_overrides SET {sets} WHERE host_id=?", (hid,))
-            c.commit()
+            with c:
+                c.execute(f"UPDATE host_overrides SET {sets} WHERE host_id=?", (hid,))
             continue
         if ch == "s":
             msb = input(
                 f"max_snapshot_bytes [{vals.get('max_snapshot_bytes')}]: "
             ).strip()
-            if msb:
-                c.execute(
-                    "UPDATE host_overrides SET max_snapshot_bytes=? WHERE host_id=?",
-                    (int(msb), hid),
-                )
             gz = input(f"gzip_snapshots [{vals.get('gzip_snapshots')}]: ").strip()
-            if gz:
-                c.execute(
-                    "UPDATE host_overrides SET gzip_snapshots=? WHERE host_id=?",
-                    (int(gz), hid),
-                )
             to = input(
                 f"command_timeout_sec [{vals.get('command_timeout_sec')}]: "
             ).strip()
-            if to:
-                c.execute(
-                    "UPDATE host_overrides SET command_timeout_sec=? WHERE host_id=?",
-                    (int(to), hid),
-                )
-            c.commit()
+            with c:
+                if msb:
+                    c.execute(
+                        "UPDATE host_overrides SET max_snapshot_bytes=? WHERE host_id=?",
+                        (int(msb), hid),
+                    )
+                if gz:
+                    c.execute(
+                        "UPDATE host_overrides SET gzip_snapshots=? WHERE host_id=?",
+                        (int(gz), hid),
+                    )
+                if to:
+                    c.execute(
+                        "UPDATE host_overrides SET command_timeout_sec=? WHERE host_id=?",
+                        (int(to), hid),
+                    )
             continue
         try:
             idx = int(ch) - 1
@@ -194,15 +257,31 @@ def host_overrides_menu(c):
                 newv = 1
             else:
                 newv = None
-            c.execute(f"UPDATE host_overrides SET {key}=? WHERE host_id=?", (newv, hid))
-            c.commit()
+            with c:
+                c.execute(update_stmts[key], (newv, hid))
         except Exception:
             print("Invalid choice.")
 
 
+def install_completer(c):
+    """Give every input() free line editing, history and tab-completion of
+    configured hostnames; mistyping a host no longer means full re-entry."""
+    if readline is None:
+        return
+
+    def complete(text, state):
+        names = [r[0] for r in c.execute("SELECT hostname FROM hosts")]
+        matches = [n for n in names if n.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(complete)
+    readline.parse_and_bind("tab: complete")
+
+
 def main():
     c = conn()
     ensure_schema(c)
+    install_completer(c)
     while True:
         print("\nAuditron Config Utility")
         print(" 1) List hosts")
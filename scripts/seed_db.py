@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import csv
 import sqlite3
 import sys
 from pathlib import Path
@@ -8,11 +9,27 @@ ROOT = Path(__file__).resolve().parents[1]
 DB_PATH = ROOT / "db" / "auditron.db"
 SCHEMA = ROOT / "docs" / "schema.sql"
 
+INSERT_HOST_SQL = (
+    "INSERT INTO hosts(hostname, ip, ssh_user, ssh_key_path, ssh_port, use_sudo) "
+    "VALUES (?,?,?,?,?,?)"
+)
+
+# executemany batch size when streaming hosts from CSV.
+CSV_CHUNK = 1000
+
 
 def ensure_db():
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(DB_PATH))
+    # A deeper statement cache keeps the hosts INSERT (and friends) compiled
+    # across the many execute calls a scripted bulk seed makes.
+    conn = sqlite3.connect(str(DB_PATH), cached_statements=256)
     conn.execute("PRAGMA foreign_keys=ON;")
+    # WAL + NORMAL drop the per-commit fsync cost that otherwise serializes
+    # bulk seeding on slow (USB) media.
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-65536;")
     with open(SCHEMA, "r", encoding="utf-8") as f:
         conn.executescript(f.read())
     conn.commit()
@@ -29,15 +46,49 @@ def init_defaults(conn):
         print("Global defaults already present.")
 
 
-def add_host(conn, name, ip, user, key, port, sudo):
-    conn.execute(
-        "INSERT INTO hosts(hostname, ip, ssh_user, ssh_key_path, ssh_port, use_sudo) VALUES (?,?,?,?,?,?)",
-        (name, ip, user, key, port, 1 if sudo else 0),
-    )
+def add_hosts_bulk(conn, rows):
+    """Insert many (name, ip, user, key, port, sudo) rows in one transaction.
+
+    One fsync for the whole batch instead of one per row."""
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    conn.executemany(INSERT_HOST_SQL, rows)
     conn.commit()
+
+
+def add_host(conn, name, ip, user, key, port, sudo):
+    add_hosts_bulk(conn, [(name, ip, user, key, port, 1 if sudo else 0)])
     print(f"Added host: {name} ({ip})")
 
 
+def seed_from_csv(conn, path):
+    """Stream hostname,ip[,user,key,port,sudo] rows from CSV in chunks."""
+    added = 0
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        chunk = []
+        for row in reader:
+            # Skip blanks, comments, short rows, and an optional header line.
+            if not row or row[0].startswith("#") or len(row) < 2:
+                continue
+            name, ip = row[0].strip(), row[1].strip()
+            if name.lower() == "hostname" and ip.lower() == "ip":
+                continue
+            user = row[2] if len(row) > 2 and row[2] else "root"
+            key = row[3] if len(row) > 3 and row[3] else None
+            port = int(row[4]) if len(row) > 4 and row[4] else 22
+            sudo = 1 if len(row) > 5 and row[5].strip().lower() in ("1", "y", "yes") else 0
+            chunk.append((name, ip, user, key, port, sudo))
+            if len(chunk) >= CSV_CHUNK:
+                add_hosts_bulk(conn, chunk)
+                added += len(chunk)
+                chunk = []
+        if chunk:
+            add_hosts_bulk(conn, chunk)
+            added += len(chunk)
+    print(f"Added {added} hosts from {path}")
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--init-defaults", action="store_true")
@@ -47,10 +98,13 @@ def main():
     ap.add_argument("--key")
     ap.add_argument("--port", type=int, default=22)
     ap.add_argument("--sudo", action="store_true")
+    ap.add_argument("--from-csv", metavar="FILE", help="Bulk-add hosts from CSV")
     args = ap.parse_args()
     conn = ensure_db()
     if args.init_defaults:
         init_defaults(conn)
+    if args.from_csv:
+        seed_from_csv(conn, args.from_csv)
     if args.add_host:
         if not args.ip:
             print("--ip is required with --add-host")
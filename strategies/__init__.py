@@ -1,20 +1,22 @@
-from .base import AuditCheck  # re-export
-from .osinfo import OSInfo
-from .processes import Processes
-from .routes import Routes
-from .rpm_inventory import RpmInventory
-from .rpm_verify import RpmVerify
-from .sockets import Sockets
+"""Strategy package with self-registering checks.
 
-REGISTRY = [OSInfo, Processes, Routes, RpmInventory, RpmVerify, Sockets]
+Check classes register themselves via AuditCheck.__init_subclass__ as
+their modules are imported; this file only discovers the modules with
+pkgutil, so adding a strategy is dropping a file in this package — no
+registry edit, no import-list drift.
+"""
+import importlib
+import pkgutil
 
-__all__ = [
-    "AuditCheck",
-    "OSInfo",
-    "Processes",
-    "Routes",
-    "RpmInventory",
-    "RpmVerify",
-    "Sockets",
-    "REGISTRY",
-]
+from .base import _REGISTRY, AuditCheck  # re-export
+
+for _finder, _name, _ispkg in pkgutil.iter_modules(__path__):
+    if _name != "base":
+        importlib.import_module(f".{_name}", __name__)
+
+REGISTRY: tuple[type[AuditCheck], ...] = tuple(_REGISTRY)
+
+# Keep `from strategies import OSInfo` etc. working for callers and tests.
+globals().update({cls.__name__: cls for cls in REGISTRY})
+
+__all__ = ["AuditCheck", "REGISTRY", *(cls.__name__ for cls in REGISTRY)]
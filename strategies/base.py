@@ -1,31 +1,81 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Any, Optional
 
+from utils.ssh_runner import SSHResult
 
+
+@dataclass(slots=True)
 class AuditContext:
-    def __init__(
-        self,
-        host: dict,
-        ssh: Any,
-        db: Any,
-        limits: dict,
-        clock: Any,
-        session_id: Optional[int] = None,
-    ):
-        self.host = host
-        self.ssh = ssh
-        self.db = db
-        self.limits = limits
-        self.clock = clock
-        self.session_id = session_id
+    host: Any  # sqlite3.Row (or dict) with the hosts table columns
+    ssh: Any
+    db: Any
+    limits: dict
+    clock: Any
+    session_id: Optional[int] = None
+    # Remote binary availability, probed once per host ({"rpm": True, ...}).
+    capabilities: Optional[dict] = None
+    # Output prefetched by the per-host batch script, keyed by check name.
+    cache: Optional[dict] = None
+
+    def has_binary(self, binary: str) -> bool:
+        """Check remote binary availability from the one-shot capability probe,
+        falling back to a per-binary ssh.which() when no probe ran."""
+        if self.capabilities is not None and binary in self.capabilities:
+            return bool(self.capabilities[binary])
+        return bool(self.ssh.which(binary))
+
+
+# Populated by AuditCheck.__init_subclass__ as check modules are imported;
+# strategies/__init__ freezes it into the public REGISTRY tuple.
+_REGISTRY: list = []
+
+# probe() results memoized per (check class, host, session); worst case for
+# a probe that falls through to ssh.which() is one SSH round-trip, and the
+# orchestrator probes both when prefetching and when gating each check.
+_PROBE_CACHE: dict = {}
 
 
 class AuditCheck(ABC):
+    # Checks are stateless; empty __slots__ keeps instances dict-free so
+    # subclasses inherit the saving by declaring their own empty __slots__.
+    __slots__ = ()
+
     name: str = "base"
     requires: tuple[str, ...] = ()
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _REGISTRY.append(cls)
+
     def probe(self, ctx: "AuditContext") -> bool:
-        return True
+        return all(ctx.has_binary(b) for b in self.requires)
+
+    def probe_cached(self, ctx: "AuditContext") -> bool:
+        """probe() memoized per (check class, host, session)."""
+        key = (type(self), ctx.host["id"], ctx.session_id)
+        try:
+            return _PROBE_CACHE[key]
+        except KeyError:
+            result = _PROBE_CACHE[key] = self.probe(ctx)
+            return result
+
+    def batch_command(self, ctx: "AuditContext") -> Optional[str]:
+        """Primary remote command whose output the orchestrator may prefetch
+        in the per-host batch script; None means the check manages its own
+        SSH traffic."""
+        return None
+
+    def fetch(self, ctx: "AuditContext", command: str) -> SSHResult:
+        """Run the check's primary command, preferring prefetched output so a
+        batched host pays one SSH round-trip for all checks. A present but
+        empty section is a valid result (a clean host's rpm -Va emits
+        nothing); only a missing section falls back to ssh.run()."""
+        if ctx.cache is not None:
+            out = ctx.cache.get(self.name)
+            if out is not None:
+                return SSHResult(0, out, "")
+        return ctx.ssh.run(command)
 
     @abstractmethod
     def run(self, ctx: "AuditContext") -> None: ...
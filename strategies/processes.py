@@ -1,39 +1,84 @@
+import re
+
 from .base import AuditCheck, AuditContext
 
+# One C-level pass per ps line: pid, ppid, user, etime, cmd. lstart was
+# dropped from the format: its five-token date made parsing ambiguous, so
+# start_time is derived from etime against one clock reading instead.
+_PS_RE = re.compile(r"^\s*(\d+)\s+(\d+)\s+(\S+)\s+(\S+)\s+(.*)$")
+
+
+def _etime_seconds(etime: str) -> int:
+    """Convert ps etime ([[dd-]hh:]mm:ss) to seconds."""
+    days, _, clock = etime.rpartition("-")
+    secs = 0
+    for part in clock.split(":"):
+        secs = secs * 60 + int(part)
+    return secs + (int(days) * 86400 if days else 0)
+
+
+_PS_CMD = "ps -eo pid=,ppid=,user=,etime=,cmd="
+
 
 class Processes(AuditCheck):
+    __slots__ = ()
+
     name = "processes"
     requires = ("ps",)
 
-    def probe(self, ctx: AuditContext) -> bool:
-        return ctx.ssh.which("ps")
+    def batch_command(self, ctx: AuditContext) -> str:
+        return _PS_CMD
 
     def run(self, ctx: AuditContext) -> None:
         from utils.db import mark_check, record_error, start_check
 
         cid = start_check(ctx.db, ctx.session_id, ctx.host["id"], self.name)
         try:
-            ctx.db.execute("DELETE FROM processes WHERE host_id=?", (ctx.host["id"],))
-            res = ctx.ssh.run("ps -eo pid,ppid,user,lstart,etime,cmd --no-headers")
-            if res.rc != 0 and not res.out.strip():
-                record_error(ctx.db, cid, "run", res.err, res.rc)
+            # Append the snapshot tagged with the session instead of deleting
+            # the previous one: pure insert traffic in the WAL, and older
+            # sessions remain queryable as history. Lines stream from the
+            # prefetched section when present, otherwise straight off the SSH
+            # channel, so the full process table is never held in memory.
+            cached = ctx.cache.get(self.name) if ctx.cache else None
+            lines = (
+                cached.splitlines() if cached else ctx.ssh.run_stream(_PS_CMD)
+            )
+            now = ctx.clock.time()
+
+            def rows():
+                for line in lines:
+                    m = _PS_RE.match(line)
+                    if not m:
+                        continue
+                    pid, ppid, user, etime, cmd = m.groups()
+                    try:
+                        started = now - _etime_seconds(etime)
+                    except ValueError:
+                        continue
+                    start_time = ctx.clock.strftime(
+                        "%Y-%m-%dT%H:%M:%SZ", ctx.clock.gmtime(started)
+                    )
+                    yield (
+                        ctx.host["id"],
+                        ctx.session_id,
+                        int(pid),
+                        int(ppid),
+                        user,
+                        start_time,
+                        etime,
+                        cmd,
+                    )
+
+            # executemany consumes the generator: one Python->C dispatch for
+            # the whole snapshot, rows bound as they are parsed.
+            cur = ctx.db.executemany(
+                "INSERT INTO processes(host_id,session_id,pid,ppid,user,start_time,etime,cmd) VALUES (?,?,?,?,?,?,?,?)",
+                rows(),
+            )
+            if cur.rowcount <= 0:
+                record_error(ctx.db, cid, "run", "no parseable ps output", -1)
                 mark_check(ctx.db, cid, "ERROR", "ps failed")
                 return
-            for line in res.out.splitlines():
-                if not line.strip():
-                    continue
-                parts = line.split(None, 6)
-                if len(parts) < 7:
-                    continue
-                pid, ppid, user, w1, w2, w3, rest = parts
-                start_time = " ".join([w1, w2, w3])
-                etime_cmd = rest.split(None, 1)
-                etime = etime_cmd[0]
-                cmd = etime_cmd[1] if len(etime_cmd) > 1 else ""
-                ctx.db.execute(
-                    "INSERT INTO processes(host_id,pid,ppid,user,start_time,etime,cmd) VALUES (?,?,?,?,?,?,?)",
-                    (ctx.host["id"], int(pid), int(ppid), user, start_time, etime, cmd),
-                )
             ctx.db.commit()
             mark_check(ctx.db, cid, "SUCCESS", None)
         except Exception as e:
@@ -1,51 +1,42 @@
 from .base import AuditCheck, AuditContext
 
+# All routing probes in one remote command, sections joined by ASCII unit
+# separators: current routes, rules, then config (route-*/ifcfg-* files and
+# nmcli when present). One SSH round-trip instead of four.
+_ROUTES_CMD = (
+    "ip route show 2>/dev/null; printf '\\037'; "
+    "ip rule show 2>/dev/null; printf '\\037'; "
+    'for f in /etc/sysconfig/network-scripts/route-*; do [ -f "$f" ] && echo -e "\\n## $f" && cat "$f"; done 2>/dev/null; '
+    'for f in /etc/sysconfig/network-scripts/ifcfg-*; do [ -f "$f" ] && echo -e "\\n## $f" && egrep \'^(NAME|DEVICE|BOOTPROTO|IPADDR|GATEWAY|PREFIX|ONBOOT)=\' "$f"; done 2>/dev/null; '
+    "command -v nmcli >/dev/null 2>&1 && nmcli -t -f connection.id,connection.type,ipv4.method,ipv4.addresses,ipv4.gateway,ipv4.routes connection show; true"
+)
+
 
 class Routes(AuditCheck):
+    __slots__ = ()
+
     name = "routes"
     requires = ("ip",)
 
-    def probe(self, ctx: AuditContext) -> bool:
-        return ctx.ssh.which("ip")
+    def batch_command(self, ctx: AuditContext) -> str:
+        return _ROUTES_CMD
 
     def run(self, ctx: AuditContext) -> None:
         from utils.db import mark_check, record_error, start_check, ts
 
         cid = start_check(ctx.db, ctx.session_id, ctx.host["id"], self.name)
         try:
-            cur_routes = ctx.ssh.run("ip route show || true").out
-            cur_rules = ctx.ssh.run("ip rule show || true").out
-            cfg_parts = []
-            cfg_parts.append(
-                ctx.ssh.run(
-                    'for f in /etc/sysconfig/network-scripts/route-*; do [ -f "$f" ] && echo -e "\\n## $f" && cat "$f"; done 2>/dev/null || true'
-                ).out
-            )
-            cfg_parts.append(
-                ctx.ssh.run(
-                    'for f in /etc/sysconfig/network-scripts/ifcfg-*; do [ -f "$f" ] && echo -e "\\n## $f" && egrep \'^(NAME|DEVICE|BOOTPROTO|IPADDR|GATEWAY|PREFIX|ONBOOT)=\' "$f"; done 2>/dev/null || true'
-                ).out
-            )
-            if ctx.ssh.which("nmcli"):
-                cfg_parts.append(
-                    ctx.ssh.run(
-                        "nmcli -t -f connection.id,connection.type,ipv4.method,ipv4.addresses,ipv4.gateway,ipv4.routes connection show || true"
-                    ).out
-                )
-            cfg_text = "\n".join([p for p in cfg_parts if p])
+            res = self.fetch(ctx, _ROUTES_CMD)
+            cur_routes, cur_rules, cfg_text = (res.out.split("\x1f") + ["", ""])[:3]
 
             now = ts()
-            ctx.db.execute(
-                "INSERT INTO routing_state(host_id,kind,content,captured_at) VALUES (?,?,?,?)",
-                (ctx.host["id"], "current", cur_routes, now),
-            )
-            ctx.db.execute(
-                "INSERT INTO routing_state(host_id,kind,content,captured_at) VALUES (?,?,?,?)",
-                (ctx.host["id"], "rules", cur_rules, now),
-            )
-            ctx.db.execute(
+            ctx.db.executemany(
                 "INSERT INTO routing_state(host_id,kind,content,captured_at) VALUES (?,?,?,?)",
-                (ctx.host["id"], "config", cfg_text, now),
+                [
+                    (ctx.host["id"], "current", cur_routes, now),
+                    (ctx.host["id"], "rules", cur_rules, now),
+                    (ctx.host["id"], "config", cfg_text, now),
+                ],
             )
             ctx.db.commit()
             mark_check(ctx.db, cid, "SUCCESS", None)
@@ -2,40 +2,52 @@ from utils.db import mark_check, record_error, start_check
 
 from .base import AuditCheck, AuditContext
 
+_QA_FMT = "%{NAME}|%{EPOCH}|%{VERSION}|%{RELEASE}|%{ARCH}|%{INSTALLTIME}\\n"
+_QA_CMD = f"rpm -qa --qf '{_QA_FMT}'"
+
+
+def _iter_rows(lines, host_id: int):
+    """Yield insert tuples straight from rpm -qa lines; no intermediate list,
+    one bounded split per line."""
+    for ln in lines:
+        if not ln:
+            continue
+        parts = ln.split("|", 5)
+        if len(parts) < 6:
+            continue
+        name, epoch, ver, rel, arch, inst = parts
+        yield (host_id, name, epoch, ver, rel, arch, int(inst) if inst.isdigit() else None)
+
 
 class RpmInventory(AuditCheck):
+    __slots__ = ()
+
     name = "rpm_inventory"
     requires = ("rpm",)
 
-    def probe(self, ctx: AuditContext) -> bool:
-        return bool(ctx.ssh.which("rpm"))
+    def batch_command(self, ctx: AuditContext) -> str:
+        return _QA_CMD
 
     def run(self, ctx: AuditContext) -> None:
         cid = start_check(ctx.db, ctx.session_id, ctx.host["id"], self.name)
         try:
-            fmt = "%{NAME}|%{EPOCH}|%{VERSION}|%{RELEASE}|%{ARCH}|%{INSTALLTIME}\\n"
-            res = ctx.ssh.run(f"rpm -qa --qf '{fmt}'")
-            if res.rc != 0:
-                record_error(ctx.db, cid, "run", res.err, res.rc)
+            # Prefer the prefetched batch section; otherwise stream lines off
+            # the SSH channel so the package list is never buffered whole and
+            # remote rpm work overlaps local parsing. run_stream raises on a
+            # nonzero exit status, so a stream cut short mid-inventory lands
+            # in the except below and is recorded as ERROR, never as a
+            # complete package list.
+            cached = ctx.cache.get(self.name) if ctx.cache else None
+            lines = cached.splitlines() if cached else ctx.ssh.run_stream(_QA_CMD)
+            cur = ctx.db.executemany(
+                "INSERT INTO rpm_packages(host_id,name,epoch,version,release,arch,install_time) VALUES (?,?,?,?,?,?,?)",
+                _iter_rows(lines, ctx.host["id"]),
+            )
+            if cur.rowcount <= 0:
+                record_error(ctx.db, cid, "run", "no parseable rpm -qa output", -1)
                 mark_check(ctx.db, cid, "ERROR", "rpm -qa failed")
                 return
-
-            rows: list[tuple] = []
-            for ln in (ln for ln in res.out.splitlines() if ln.strip()):
-                parts = (ln.split("|") + ["", "", "", "", "", ""])[:6]
-                name, epoch, ver, rel, arch, inst = parts
-                try:
-                    inst_val = int(inst)
-                except ValueError:
-                    inst_val = None
-                rows.append((ctx.host["id"], name, epoch, ver, rel, arch, inst_val))
-
-            if rows:
-                ctx.db.executemany(
-                    "INSERT INTO rpm_packages(host_id,name,epoch,version,release,arch,install_time) VALUES (?,?,?,?,?,?,?)",
-                    rows,
-                )
-                ctx.db.commit()
+            ctx.db.commit()
 
             mark_check(ctx.db, cid, "SUCCESS", None)
         except Exception as e:  # noqa: BLE001 - keep broad to log unexpected failures
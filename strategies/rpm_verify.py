@@ -1,105 +1,193 @@
 import base64
 import shlex
+import sqlite3
 from typing import Optional
 
-from utils.compress import gz_bytes, sha256_bytes
+from utils.compress import compress_bytes, sha256_bytes
 from utils.db import mark_check, record_error, start_check, ts
 from utils.parsing import parse_rpm_verify
 
 from .base import AuditCheck, AuditContext
 
+_VERIFY_CMD = "rpm -Va --nodigest --nosignature || true"
+
+# Framing for the batched per-file scripts: unit separator between fields,
+# group separator between records (same convention as the check prefetch).
+_FIELD_SEP = "\x1f"
+_REC_SEP = "\x1d"
+# Paths per remote invocation, kept well under argv limits.
+_PATH_CHUNK = 200
+
+_EMPTY_META = (None, None, None, None, None, None)
+
+# INSERT ... RETURNING (SQLite >= 3.35) hands back the rowid in the same
+# statement, halving the Python<->SQLite calls in the verify inner loop.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+_INSERT_META = (
+    "INSERT INTO file_meta(path, mode, uid, gid, size, mtime, inode, sha256) "
+    "VALUES (?,?,?,?,?,?,?,?)"
+)
+_INSERT_SNAP = (
+    "INSERT INTO file_snapshots(path, mode, uid, gid, size, mtime, inode, sha256, "
+    "gz_len, gz_b64, codec, captured_at) VALUES (?,?,?,?,?,?,?,?,?,?,?,?)"
+)
+
+
+def _insert_row_id(db, sql: str, params: tuple) -> int:
+    if _HAS_RETURNING:
+        return int(db.execute(sql + " RETURNING id", params).fetchone()[0])
+    db.execute(sql, params)
+    return int(db.execute("SELECT last_insert_rowid()").fetchone()[0])
+
 
 class RpmVerify(AuditCheck):
+    __slots__ = ()
+
     name = "rpm_verify"
     requires = ("rpm",)
 
-    def probe(self, ctx: AuditContext) -> bool:
-        return bool(ctx.ssh.which("rpm"))
-
-    def _stat_meta(self, ctx: AuditContext, path_q: str) -> tuple[
-        Optional[int],
-        Optional[int],
-        Optional[int],
-        Optional[int],
-        Optional[int],
-        Optional[int],
-    ]:
-        # mode(hex), uid, gid, size, mtime, inode
-        stat_cmd = f"stat -c '%f|%u|%g|%s|%Y|%i' {path_q}"
-        stat_res = ctx.ssh.run(stat_cmd)
-        if stat_res.rc == 0 and stat_res.out.strip():
-            fhex, uid, gid, size, mtime, inode = (
-                stat_res.out.strip().split("|") + ["0", "0", "0", "0", "0", "0"]
-            )[:6]
-            try:
-                mode = int(fhex, 16)
-            except ValueError:
-                mode = None
+    def batch_command(self, ctx: AuditContext) -> str:
+        return _VERIFY_CMD
+
+    @staticmethod
+    def _parse_stat(out: str) -> tuple:
+        # mode(hex)|uid|gid|size|mtime|inode
+        if not out:
+            return _EMPTY_META
+        fhex, uid, gid, size, mtime, inode = (out.split("|") + ["0"] * 6)[:6]
+        try:
+            mode: Optional[int] = int(fhex, 16)
+        except ValueError:
+            mode = None
+        try:
             return mode, int(uid), int(gid), int(size), int(mtime), int(inode)
-        return None, None, None, None, None, None
+        except ValueError:
+            return _EMPTY_META
+
+    def _batch_stat(self, ctx: AuditContext, paths: list) -> dict:
+        """One stat invocation per chunk of paths, keyed by %n, instead of a
+        remote shell loop spawning a stat process per file."""
+        meta = {}
+        for i in range(0, len(paths), _PATH_CHUNK):
+            plist = " ".join(shlex.quote(p) for p in paths[i : i + _PATH_CHUNK])
+            out = ctx.ssh.run(
+                f"stat -Lc '%n|%f|%u|%g|%s|%Y|%i' -- {plist} 2>/dev/null"
+            ).out
+            # Missing paths emit no line and fall back to NULL meta.
+            for ln in out.splitlines():
+                path, sep, stat_out = ln.partition("|")
+                if sep:
+                    meta[path] = self._parse_stat(stat_out)
+        return meta
+
+    def _batch_snapshot(self, ctx: AuditContext, paths: list, max_bytes: int) -> dict:
+        """Fetch mime type and base64 body for changed files in framed remote
+        loops; only text-like files within the snapshot limit are returned."""
+        snaps = {}
+        for i in range(0, len(paths), _PATH_CHUNK):
+            plist = " ".join(shlex.quote(p) for p in paths[i : i + _PATH_CHUNK])
+            script = (
+                f"for p in {plist}; do "
+                'printf "%s\\037" "$p"; '
+                'head -c 512 -- "$p" 2>/dev/null | file -b - | tr -d "\\n"; '
+                'printf "\\037"; '
+                f'if [ "$(stat -Lc %s -- "$p" 2>/dev/null || echo 0)" -le {max_bytes} ]; '
+                'then base64 -w0 -- "$p" 2>/dev/null; fi; '
+                'printf "\\035"; done'
+            )
+            for rec in ctx.ssh.run(script).out.split(_REC_SEP):
+                parts = rec.split(_FIELD_SEP)
+                if len(parts) < 3:
+                    continue
+                path, mime, b64 = parts[0], parts[1].lower(), parts[2]
+                if b64 and ("text" in mime or "ascii" in mime):
+                    snaps[path] = b64
+        return snaps
 
     def run(self, ctx: AuditContext) -> None:
         cid = start_check(ctx.db, ctx.session_id, ctx.host["id"], self.name)
         try:
-            res = ctx.ssh.run("rpm -Va --nodigest --nosignature || true")
-            for flags, path in parse_rpm_verify(res.out):
+            res = self.fetch(ctx, _VERIFY_CMD)
+            parsed = parse_rpm_verify(res.out)
+            # On a clean host most rpm -Va rows are unchanged and need no
+            # metadata or snapshot, so both batched passes cover only the
+            # changed paths.
+            changed_paths = [p for flags, p in parsed if set(flags) - {"."}]
+            meta_by_path = self._batch_stat(ctx, changed_paths)
+            snaps_by_path = self._batch_snapshot(
+                ctx, changed_paths, int(ctx.limits.get("max_snapshot_bytes", 524288))
+            )
+            links: list[tuple] = []
+            for flags, path in parsed:
                 changed = 0 if set(flags) <= {"."} else 1
-                path_q = shlex.quote(path)
+                if not changed:
+                    links.append(
+                        (ctx.host["id"], None, path, flags, 0, None, None)
+                    )
+                    continue
+
+                # Decode the captured body (when any) first: its locally
+                # computed sha256 feeds both file_meta and the snapshot, with
+                # no remote hashing round-trip. Files without a body keep a
+                # NULL sha.
+                data = None
+                if path in snaps_by_path:
+                    try:
+                        data = base64.b64decode(snaps_by_path[path])
+                    except ValueError:
+                        data = None
+                sha_hex = sha256_bytes(data) if data is not None else None
 
                 # File meta
-                mode, uid, gid, size, mtime, inode = self._stat_meta(ctx, path_q)
+                mode, uid, gid, size, mtime, inode = meta_by_path.get(
+                    path, _EMPTY_META
+                )
                 meta_id = None
                 if any(v is not None for v in (mode, uid, gid, size, mtime, inode)):
-                    ctx.db.execute(
-                        "INSERT INTO file_meta(path, mode, uid, gid, size, mtime, inode, sha256) VALUES (?,?,?,?,?,?,?,?)",
-                        (path, mode, uid, gid, size, mtime, inode, None),
-                    )
-                    meta_id = int(
-                        ctx.db.execute("SELECT last_insert_rowid()").fetchone()[0]
+                    meta_id = _insert_row_id(
+                        ctx.db,
+                        _INSERT_META,
+                        (path, mode, uid, gid, size, mtime, inode, sha_hex),
                     )
 
                 # Snapshot for text-like changed files
                 snapshot_id = None
-                if changed:
-                    file_cmd = f"head -c 512 {path_q} | file -b -"
-                    file_res = ctx.ssh.run(file_cmd)
-                    if file_res.rc == 0 and (
-                        "text" in file_res.out.lower()
-                        or "ascii" in file_res.out.lower()
-                    ):
-                        cat_res = ctx.ssh.run(f"cat {path_q}")
-                        if cat_res.rc == 0:
-                            data = cat_res.out.encode("utf-8", errors="ignore")
-                            sha_hex = sha256_bytes(data)
-                            gz = gz_bytes(data)
-                            ctx.db.execute(
-                                "INSERT INTO file_snapshots(path, mode, uid, gid, size, mtime, inode, sha256, gz_len, gz_b64, captured_at) VALUES (?,?,?,?,?,?,?,?,?,?,?)",
-                                (
-                                    path,
-                                    mode,
-                                    uid,
-                                    gid,
-                                    size,
-                                    mtime,
-                                    inode,
-                                    sha_hex,
-                                    len(gz),
-                                    base64.b64encode(gz).decode("ascii"),
-                                    ts(),
-                                ),
-                            )
-                            snapshot_id = int(
-                                ctx.db.execute("SELECT last_insert_rowid()").fetchone()[
-                                    0
-                                ]
-                            )
-
-                # Link row
-                ctx.db.execute(
-                    "INSERT INTO rpm_verified_files(host_id, package_id, path, verify_flags, changed, snapshot_id, meta_id) VALUES (?,?,?,?,?,?,?)",
-                    (ctx.host["id"], None, path, flags, changed, snapshot_id, meta_id),
+                if data is not None:
+                    payload, alg = compress_bytes(
+                        data, ctx.limits.get("compress_alg", "zstd")
+                    )
+                    snapshot_id = _insert_row_id(
+                        ctx.db,
+                        _INSERT_SNAP,
+                        (
+                            path,
+                            mode,
+                            uid,
+                            gid,
+                            size,
+                            mtime,
+                            inode,
+                            sha_hex,
+                            len(payload),
+                            base64.b64encode(payload).decode("ascii"),
+                            alg,
+                            ts(),
+                        ),
+                    )
+
+                links.append(
+                    (ctx.host["id"], None, path, flags, 1, snapshot_id, meta_id)
                 )
 
+            # Link rows carry no id dependency, so they land in one
+            # executemany; meta/snapshot inserts stay per-row because their
+            # rowids feed these tuples. Everything commits as one
+            # transaction.
+            ctx.db.executemany(
+                "INSERT INTO rpm_verified_files(host_id, package_id, path, verify_flags, changed, snapshot_id, meta_id) VALUES (?,?,?,?,?,?,?)",
+                links,
+            )
             ctx.db.commit()
             mark_check(ctx.db, cid, "SUCCESS", None)
         except Exception as e:  # noqa: BLE001
@@ -5,20 +5,28 @@ from .base import AuditCheck, AuditContext
 
 
 class Sockets(AuditCheck):
+    __slots__ = ()
+
     name = "sockets"
     requires: tuple[str, ...] = ()
 
     def probe(self, ctx: AuditContext) -> bool:
-        return bool(ctx.ssh.which("ss") or ctx.ssh.which("netstat"))
+        return ctx.has_binary("ss") or ctx.has_binary("netstat")
+
+    def _cmd(self, ctx: AuditContext) -> str:
+        return "ss -lptnH" if ctx.has_binary("ss") else (
+            "netstat -lptn --numeric-hosts | tail -n +3"
+        )
+
+    def batch_command(self, ctx: AuditContext) -> str:
+        return self._cmd(ctx)
 
     def run(self, ctx: AuditContext) -> None:
         cid = start_check(ctx.db, ctx.session_id, ctx.host["id"], self.name)
         try:
-            use_ss = bool(ctx.ssh.which("ss"))
-            cmd = (
-                "ss -lptnH" if use_ss else "netstat -lptn --numeric-hosts | tail -n +3"
-            )
-            res = ctx.ssh.run(cmd)
+            use_ss = ctx.has_binary("ss")
+            cmd = self._cmd(ctx)
+            res = self.fetch(ctx, cmd)
             if res.rc != 0 and not res.out.strip():
                 record_error(ctx.db, cid, "run", res.err, res.rc)
                 mark_check(ctx.db, cid, "ERROR", f"{cmd} failed")
@@ -0,0 +1,12 @@
+from auditron import parse_skip
+
+
+def test_parse_skip_strips_whitespace():
+    skip = parse_skip("osinfo, processes")
+    assert skip == frozenset({"osinfo", "processes"})
+
+
+def test_parse_skip_empty_and_none():
+    assert parse_skip("") == frozenset()
+    assert parse_skip(None) == frozenset()
+    assert parse_skip(" , ,") == frozenset()
@@ -6,3 +6,18 @@ def test_parse_rpm_verify_basic():
     rows = parse_rpm_verify(out)
     assert rows[0][0].startswith("SM5DLUGT")
     assert rows[0][1] == "/etc/foo.conf"
+
+
+def test_etime_seconds_forms():
+    from strategies.processes import _etime_seconds
+
+    assert _etime_seconds("05:03") == 5 * 60 + 3
+    assert _etime_seconds("01:02:03") == 3600 + 2 * 60 + 3
+    assert _etime_seconds("2-01:02:03") == 2 * 86400 + 3600 + 2 * 60 + 3
+
+
+def test_parse_rpm_verify_class_and_missing():
+    out = "S.5....T. c /etc/ssh/sshd_config\nmissing   d /usr/share/doc/x\n"
+    rows = parse_rpm_verify(out)
+    assert rows[0] == ("S.5....T.", "/etc/ssh/sshd_config")
+    assert rows[1] == ("missing", "/usr/share/doc/x")
@@ -1,6 +1,11 @@
 import gzip
 import hashlib
 
+try:
+    import zstandard
+except ImportError:  # optional; compress_bytes falls back to gzip
+    zstandard = None
+
 
 def sha256_bytes(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
@@ -8,3 +13,20 @@ def sha256_bytes(b: bytes) -> str:
 
 def gz_bytes(b: bytes) -> bytes:
     return gzip.compress(b, compresslevel=6)
+
+
+def zstd_bytes(b: bytes) -> bytes:
+    if zstandard is None:
+        raise RuntimeError("zstandard is not installed")
+    return zstandard.ZstdCompressor(level=3).compress(b)
+
+
+def compress_bytes(b: bytes, alg: str = "zstd") -> tuple[bytes, str]:
+    """Compress with the configured algorithm; returns (payload, alg used).
+
+    zstd-3 is ~2-3x faster than gzip-6 with a slightly better ratio, so it is
+    the preferred default; gzip remains the fallback when the zstandard
+    package is not installed."""
+    if alg == "zstd" and zstandard is not None:
+        return zstd_bytes(b), "zstd"
+    return gz_bytes(b), "gzip"
@@ -1,32 +1,152 @@
 import os
+import queue
 import sqlite3
 import time
-from typing import Optional
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional
 
 SCHEMA_PATH = os.path.join(
     os.path.dirname(os.path.dirname(__file__)), "docs", "schema.sql"
 )
 
 
-def connect(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
+@lru_cache(maxsize=None)
+def _load_schema(path: str = SCHEMA_PATH) -> str:
+    # schema.sql never changes while a process runs; read it once even when
+    # ensure_schema is called repeatedly (tests, multi-db tooling).
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def connect(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    # Row supports index-by-name without building a dict per row.
+    conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys=ON;")
+    # WAL lets readers proceed alongside the writer and NORMAL avoids a full
+    # fsync per commit — both matter for the many small check_runs writes.
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA mmap_size=268435456;")
+    conn.execute("PRAGMA cache_size=-65536;")
+    conn.execute("PRAGMA busy_timeout=5000;")
     return conn
 
 
+# Tiny LIFO connection pool: one connection per worker thread at a time, opened
+# lazily, reused across hosts so workers never share (or reopen) a connection.
+_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+_pool_db_path: Optional[str] = None
+
+
+def init_pool(db_path: str) -> None:
+    """Point the pool at a database; existing pooled connections are dropped."""
+    global _pool_db_path
+    close_pool()
+    _pool_db_path = db_path
+
+
+@contextmanager
+def pool_acquire() -> Iterator[sqlite3.Connection]:
+    if _pool_db_path is None:
+        raise RuntimeError("init_pool() must be called before pool_acquire()")
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = connect(_pool_db_path, check_same_thread=False)
+    try:
+        yield conn
+    finally:
+        _pool.put(conn)
+
+
+def close_pool() -> None:
+    while True:
+        try:
+            _pool.get_nowait().close()
+        except queue.Empty:
+            break
+
+
 def ensure_schema(conn: sqlite3.Connection) -> None:
     """Apply schema idempotently from docs/schema.sql"""
-    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
-        conn.executescript(f.read())
+    conn.executescript(_load_schema())
     conn.commit()
 
 
-def get_hosts(conn: sqlite3.Connection) -> list[dict]:
-    cur = conn.execute(
-        "SELECT id, hostname, ip, ssh_user, ssh_key_path, ssh_port, use_sudo FROM hosts ORDER BY id"
+def _hosts_where(hostname_or_ip: Optional[str]) -> tuple[str, tuple]:
+    if hostname_or_ip is None:
+        return "", ()
+    # Indexed lookup (ix_hosts_hostname / ix_hosts_ip) instead of fetching
+    # the whole fleet and filtering in Python.
+    return " WHERE hostname = ? OR ip = ?", (hostname_or_ip, hostname_or_ip)
+
+
+def get_hosts(
+    conn: sqlite3.Connection, hostname_or_ip: Optional[str] = None
+) -> Iterator[sqlite3.Row]:
+    """Yield host rows lazily; large fleets are never materialized in memory."""
+    where, params = _hosts_where(hostname_or_ip)
+    sql = (
+        "SELECT id, hostname, ip, ssh_user, ssh_key_path, ssh_port, use_sudo FROM hosts"
+        + where
+        + " ORDER BY id"
     )
-    cols = [d[0] for d in cur.description]
-    return [dict(zip(cols, row)) for row in cur.fetchall()]
+    yield from conn.execute(sql, params)
+
+
+def count_hosts(conn: sqlite3.Connection, hostname_or_ip: Optional[str] = None) -> int:
+    where, params = _hosts_where(hostname_or_ip)
+    return int(conn.execute("SELECT COUNT(*) FROM hosts" + where, params).fetchone()[0])
+
+
+LIMIT_KEYS = ("max_snapshot_bytes", "gzip_snapshots", "compress_alg", "command_timeout_sec")
+_DEFAULT_LIMITS = {
+    "max_snapshot_bytes": 524288,
+    "gzip_snapshots": 1,
+    "compress_alg": "zstd",
+    "command_timeout_sec": 60,
+}
+
+# global_defaults never changes mid-run and host_overrides is small, so both
+# are read once per process and merged in Python instead of two SELECTs per host.
+_global_limits: Optional[dict] = None
+_override_limits: Optional[dict] = None
+
+
+def load_limits(conn: sqlite3.Connection) -> tuple[dict, dict]:
+    """Snapshot global_defaults and host_overrides for resolve_limits()."""
+    global _global_limits, _override_limits
+    row = conn.execute(
+        "SELECT max_snapshot_bytes, gzip_snapshots, compress_alg, command_timeout_sec "
+        "FROM global_defaults WHERE id=1"
+    ).fetchone()
+    _global_limits = dict(zip(LIMIT_KEYS, row)) if row else dict(_DEFAULT_LIMITS)
+    _override_limits = {
+        r[0]: tuple(r)[1:]
+        for r in conn.execute(
+            "SELECT host_id, max_snapshot_bytes, gzip_snapshots, compress_alg, command_timeout_sec "
+            "FROM host_overrides"
+        )
+    }
+    return _global_limits, _override_limits
+
+
+def resolve_limits(conn: sqlite3.Connection, host_id: int) -> dict:
+    """Merge cached global defaults with any per-host override (NULL = inherit)."""
+    if _global_limits is None or _override_limits is None:
+        globals_, overrides = load_limits(conn)
+    else:
+        globals_, overrides = _global_limits, _override_limits
+    limits = dict(globals_)
+    override = overrides.get(host_id)
+    if override:
+        for key, val in zip(LIMIT_KEYS, override):
+            if val is not None:
+                limits[key] = val
+    return limits
 
 
 def get_unfinished_session(conn: sqlite3.Connection) -> Optional[int]:
@@ -38,9 +158,14 @@ def get_unfinished_session(conn: sqlite3.Connection) -> Optional[int]:
 
 
 def new_session(conn: sqlite3.Connection, mode: str) -> int:
+    # Take the write lock up front: a DEFERRED transaction that later upgrades
+    # to write can hit SQLITE_BUSY when another auditron process holds the db.
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
     conn.execute("INSERT INTO sessions(started_at, mode) VALUES (?, ?)", (ts(), mode))
+    session_id = int(conn.execute("SELECT last_insert_rowid()").fetchone()[0])
     conn.commit()
-    return int(conn.execute("SELECT last_insert_rowid()").fetchone()[0])
+    return session_id
 
 
 def finish_session(conn: sqlite3.Connection, session_id: int) -> None:
@@ -48,14 +173,22 @@ def finish_session(conn: sqlite3.Connection, session_id: int) -> None:
     conn.commit()
 
 
+# Hot-path DML kept as module constants: the same SQL text on the same
+# connection hits sqlite3's prepared-statement cache instead of re-parsing.
+SQL_START_CHECK = (
+    "INSERT INTO check_runs(session_id, host_id, check_name, started_at, status) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+SQL_MARK_CHECK = "UPDATE check_runs SET finished_at=?, status=?, reason=? WHERE id=?"
+SQL_RECORD_ERROR = (
+    "INSERT INTO errors(check_run_id, stage, stderr, exit_code) VALUES (?, ?, ?, ?)"
+)
+
+
 def start_check(
     conn: sqlite3.Connection, session_id: Optional[int], host_id: int, check_name: str
 ) -> int:
-    conn.execute(
-        "INSERT INTO check_runs(session_id, host_id, check_name, started_at, status) VALUES (?, ?, ?, ?, ?)",
-        (session_id, host_id, check_name, ts(), "SUCCESS"),
-    )
-    conn.commit()
+    conn.execute(SQL_START_CHECK, (session_id, host_id, check_name, ts(), "SUCCESS"))
     return int(conn.execute("SELECT last_insert_rowid()").fetchone()[0])
 
 
@@ -64,12 +197,41 @@ def mark_check(
     check_run_id: int,
     status: str,
     reason: Optional[str] = None,
+) -> None:
+    conn.execute(SQL_MARK_CHECK, (ts(), status, reason, check_run_id))
+
+
+def get_check_cache(
+    conn: sqlite3.Connection, host_id: int, check_name: str
+) -> Optional[tuple]:
+    row = conn.execute(
+        "SELECT sig, rid FROM check_cache WHERE host_id=? AND check_name=?",
+        (host_id, check_name),
+    ).fetchone()
+    return tuple(row) if row else None
+
+
+def set_check_cache(
+    conn: sqlite3.Connection, host_id: int, check_name: str, sig: str, rid: int
 ) -> None:
     conn.execute(
-        "UPDATE check_runs SET finished_at=?, status=?, reason=? WHERE id=?",
-        (ts(), status, reason, check_run_id),
+        "INSERT OR REPLACE INTO check_cache(host_id, check_name, sig, rid) VALUES (?,?,?,?)",
+        (host_id, check_name, sig, rid),
     )
-    conn.commit()
+
+
+def last_success_run(
+    conn: sqlite3.Connection, session_id: Optional[int], host_id: int, check_name: str
+) -> Optional[int]:
+    # start_check seeds rows with status='SUCCESS', so a run interrupted
+    # before mark_check leaves that status with finished_at NULL; only
+    # finalized runs may qualify for the resume cache.
+    row = conn.execute(
+        "SELECT id FROM check_runs WHERE session_id=? AND host_id=? AND check_name=? "
+        "AND status='SUCCESS' AND finished_at IS NOT NULL ORDER BY id DESC LIMIT 1",
+        (session_id, host_id, check_name),
+    ).fetchone()
+    return int(row[0]) if row else None
 
 
 def record_error(
@@ -79,11 +241,7 @@ def record_error(
     stderr: str,
     exit_code: Optional[int],
 ) -> None:
-    conn.execute(
-        "INSERT INTO errors(check_run_id, stage, stderr, exit_code) VALUES (?, ?, ?, ?)",
-        (check_run_id, stage, stderr, exit_code),
-    )
-    conn.commit()
+    conn.execute(SQL_RECORD_ERROR, (check_run_id, stage, stderr, exit_code))
 
 
 def ts() -> str:
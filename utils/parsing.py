@@ -1,19 +1,18 @@
 import re
 
+# rpm -Va lines have a rigid layout: an 8-9 char flag column, an optional
+# file-class letter (c/d/g/l/r), then the path. One compiled match per line
+# replaces the split/strip/startswith chain.
+_VERIFY_RE = re.compile(r"^(missing|[.A-Za-z5?]{8,9})\s+(?:[cdglr]\s+)?(.+?)\s*$")
+parse_rpm_verify_line = _VERIFY_RE.match
+
 
 def parse_rpm_verify(output: str):
     rows = []
     for line in output.splitlines():
-        line = line.rstrip()
-        if not line:
-            continue
-        parts = line.split(None, 1)
-        if len(parts) == 2:
-            flags, path = parts
-            path = path.strip()
-            if path.startswith(("c ", "d ")):
-                path = path.split()[-1]
-            rows.append((flags, path))
+        m = parse_rpm_verify_line(line)
+        if m:
+            rows.append((m.group(1), m.group(2)))
     return rows
 
 
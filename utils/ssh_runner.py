@@ -1,5 +1,9 @@
+import atexit
+import os
 import shlex
 import subprocess
+import threading
+from typing import Iterator
 
 
 class SSHResult:
@@ -9,11 +13,52 @@ class SSHResult:
         self.err = err
 
 
+# ControlPath templates registered for teardown at exit (one per mux master).
+_mux_targets: set = set()
+
+
+def _teardown_mux_masters() -> None:
+    # The ControlPath template contains %p, so the teardown call must name
+    # the same port the master was opened with or the socket path won't match.
+    for control_path, dest, port in _mux_targets:
+        subprocess.run(
+            ["ssh", "-o", f"ControlPath={control_path}", "-p", port, "-O", "exit", dest],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+
+atexit.register(_teardown_mux_masters)
+
+
 class SSHClient:
     def __init__(self, host: dict, timeout: int = 60):
         self.host = host
         self.timeout = timeout
         self._which_cache = {}
+        # AUDITRON_SSH_BACKEND=paramiko keeps one in-process transport per host
+        # instead of fork+exec'ing an ssh client per command. Default stays the
+        # OpenSSH subprocess path (with ControlMaster) during migration.
+        self._backend = os.environ.get("AUDITRON_SSH_BACKEND", "openssh")
+        self._paramiko = None  # lazily connected on first run()
+        self._connect_lock = threading.Lock()
+        # Multiplex all ssh invocations for a host over one TCP+auth session so
+        # only the first command pays the handshake. AUDITRON_SSH_NO_MUX=1 opts out.
+        self._mux_opts: list[str] = []
+        if not os.environ.get("AUDITRON_SSH_NO_MUX"):
+            control_path = f"/tmp/auditron-ssh-%r@%h:%p-{os.getpid()}"
+            self._mux_opts = [
+                "-o",
+                "ControlMaster=auto",
+                "-o",
+                "ControlPersist=60s",
+                "-o",
+                f"ControlPath={control_path}",
+            ]
+            user = self.host["ssh_user"] or "root"
+            ip = self.host["ip"] or self.host["hostname"]
+            port = str(self.host["ssh_port"] or 22)
+            _mux_targets.add((control_path, f"{user}@{ip}", port))
 
     def which(self, binary: str) -> bool:
         if binary in self._which_cache:
@@ -24,19 +69,34 @@ class SSHClient:
         self._which_cache[binary] = ok
         return ok
 
-    def run(
-        self, command: str, check: bool = False, use_sudo: bool | None = None
-    ) -> SSHResult:
-        user = self.host.get("ssh_user") or "root"
-        key = self.host.get("ssh_key_path")
-        ip = self.host.get("ip") or self.host.get("hostname")
-        port = str(self.host.get("ssh_port") or 22)
-        sudo = self.host.get("use_sudo", 1) if use_sudo is None else use_sudo
+    def _prep(self, command: str, use_sudo: bool | None) -> tuple:
+        """Resolve connection parameters and the (possibly sudo-wrapped)
+        remote command shared by run() and run_stream()."""
+        user = self.host["ssh_user"] or "root"
+        key = self.host["ssh_key_path"]
+        ip = self.host["ip"] or self.host["hostname"]
+        port = str(self.host["ssh_port"] or 22)
+        sudo = self.host["use_sudo"] if use_sudo is None else use_sudo
         remote_cmd = command if not sudo else f"sudo -n bash -lc {shlex.quote(command)}"
-        ssh_cmd = ["ssh", "-o", "BatchMode=yes", "-p", port]
+        return user, key, ip, port, remote_cmd
+
+    def _subprocess_argv(self, user, key, ip, port, remote_cmd) -> list:
+        ssh_cmd = ["ssh", "-o", "BatchMode=yes", *self._mux_opts, "-p", port]
         if key:
             ssh_cmd += ["-i", key]
         ssh_cmd += [f"{user}@{ip}", remote_cmd]
+        return ssh_cmd
+
+    def run(
+        self, command: str, check: bool = False, use_sudo: bool | None = None
+    ) -> SSHResult:
+        user, key, ip, port, remote_cmd = self._prep(command, use_sudo)
+        if self._backend == "paramiko":
+            res = self._run_paramiko(user, key, ip, int(port), remote_cmd)
+            if check and res.rc != 0:
+                raise RuntimeError(f"SSH failed rc={res.rc}: {res.err}")
+            return res
+        ssh_cmd = self._subprocess_argv(user, key, ip, port, remote_cmd)
         try:
             p = subprocess.run(
                 ssh_cmd,
@@ -50,3 +110,76 @@ class SSHClient:
             return SSHResult(p.returncode, p.stdout, p.stderr)
         except subprocess.TimeoutExpired:
             return SSHResult(124, "", f"timeout after {self.timeout}s")
+
+    def run_stream(
+        self, command: str, use_sudo: bool | None = None
+    ) -> Iterator[str]:
+        """Yield stdout lines as they arrive, without buffering full output.
+
+        Peak memory stays proportional to one line rather than the whole
+        command output — useful for large tables (ps, rpm -qa). A nonzero
+        exit status raises RuntimeError once the stream is drained, so a
+        connection dropped mid-stream can never pass for a short result;
+        callers that need rc/stderr without an exception should use run()."""
+        user, key, ip, port, remote_cmd = self._prep(command, use_sudo)
+        if self._backend == "paramiko":
+            client = self._ensure_paramiko(user, key, ip, int(port))
+            _stdin, stdout, _stderr = client.exec_command(
+                remote_cmd, timeout=self.timeout
+            )
+            for line in stdout:
+                yield line.rstrip("\n")
+            rc = stdout.channel.recv_exit_status()
+            if rc != 0:
+                raise RuntimeError(f"SSH stream failed rc={rc}")
+            return
+        p = subprocess.Popen(
+            self._subprocess_argv(user, key, ip, port, remote_cmd),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        assert p.stdout is not None  # stdout=PIPE guarantees a stream
+        try:
+            for line in p.stdout:
+                yield line.rstrip("\n")
+        finally:
+            p.stdout.close()
+            rc = p.wait()
+        # Reached only when the consumer drained the stream; abandoning the
+        # generator early propagates GeneratorExit from the loop instead.
+        if rc != 0:
+            raise RuntimeError(f"SSH stream failed rc={rc}")
+
+    def _ensure_paramiko(self, user: str, key: str, ip: str, port: int):
+        import paramiko
+
+        with self._connect_lock:
+            if self._paramiko is None:
+                client = paramiko.SSHClient()
+                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+                client.connect(
+                    ip,
+                    port=port,
+                    username=user,
+                    key_filename=key,
+                    timeout=self.timeout,
+                    allow_agent=True,
+                )
+                self._paramiko = client
+        return self._paramiko
+
+    def _run_paramiko(
+        self, user: str, key: str, ip: str, port: int, remote_cmd: str
+    ) -> SSHResult:
+        client = self._ensure_paramiko(user, key, ip, port)
+        try:
+            _stdin, stdout, stderr = client.exec_command(
+                remote_cmd, timeout=self.timeout
+            )
+            out = stdout.read().decode("utf-8", errors="replace")
+            err = stderr.read().decode("utf-8", errors="replace")
+            rc = stdout.channel.recv_exit_status()
+            return SSHResult(rc, out, err)
+        except Exception as e:  # noqa: BLE001 - mirror subprocess path's soft failure
+            return SSHResult(124, "", str(e))